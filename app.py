@@ -1,14 +1,34 @@
 import os
+import re
+import io
+import base64
 import datetime
 import hashlib
-from typing import Tuple, Optional, Union, Dict, Any, List
-
+import hmac
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from functools import wraps
+from html import escape
+from typing import FrozenSet, Tuple, Optional, Union, Dict, Any, List, Callable
+
+import pyarrow as pa
 import streamlit as st
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+from PIL import Image
+from bson import ObjectId
+from pymongo import MongoClient, InsertOne, UpdateOne, DeleteOne
+from pymongo.collection import Collection
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import ServerSelectionTimeoutError, DuplicateKeyError, BulkWriteError, OperationFailure, PyMongoError
 import smtplib
+import threading
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
 
+logger = logging.getLogger(__name__)
+
 # ============================================================
 # Configuração geral da página
 # ============================================================
@@ -26,14 +46,8 @@ st.set_page_config(
 custom_css = """
 <style>
 
-/* Escurecer toda a aplicação */
-html, body {
-    background-color: #020617;
-}
-
+/* Cores de fundo e texto vêm do tema em .streamlit/config.toml */
 .stApp {
-    background: radial-gradient(circle at top, #020617 0, #020617 40%, #020617 100%);
-    color: #e5e7eb;
     font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
 }
 
@@ -42,37 +56,19 @@ html, body {
     padding-top: 5.0rem;
 }
 
-/* Títulos */
-h1, h2, h3, h4, h5 {
-    color: #e5e7eb;
-}
-
-/* Barra de navegação superior fixa */
-.nav-bar {
-    position: fixed;
-    top: 0;
-    left: 0;
-    right: 0;
-    z-index: 999;
-    padding: 0.6rem 1.0rem;
-    background: rgba(15,23,42,0.98);
-    backdrop-filter: blur(10px);
-    border-bottom: 1px solid rgba(148,163,184,0.4);
-}
-
-/* Container para centralizar a navegação */
-.nav-inner {
-    max-width: 1100px;
+/* Navegação superior (container com key="nav") */
+.st-key-nav {
+    max-width: 900px;
     margin: 0 auto;
 }
 
 /* Rádio da navegação (ocultar label padrão) */
-.nav-inner label {
+.st-key-nav label[data-testid="stWidgetLabel"] {
     display: none;
 }
 
 /* Ajustar grupo de botões da navegação */
-.nav-inner div[role="radiogroup"] {
+.st-key-nav div[role="radiogroup"] {
     display: flex;
     justify-content: center;
     gap: 1.6rem;
@@ -99,8 +95,23 @@ h1, h2, h3, h4, h5 {
     margin-bottom: 1.2rem;
 }
 
+/* Grade de cursos */
+/* minmax(0, 1fr): colunas sempre iguais, mesmo com URLs ou palavras longas */
+.course-grid {
+    display: grid;
+    grid-template-columns: repeat(3, minmax(0, 1fr));
+    gap: 1.2rem;
+}
+
+@media (max-width: 900px) {
+    .course-grid {
+        grid-template-columns: 1fr;
+    }
+}
+
 /* Imagem de curso no card */
 .course-image {
+    width: 100%;
     border-radius: 1rem;
     margin-bottom: 0.8rem;
 }
@@ -151,12 +162,6 @@ h1, h2, h3, h4, h5 {
     color: #e5e7eb;
 }
 
-/* Sidebar (login / cadastro) */
-section[data-testid="stSidebar"] {
-    background-color: #020617;
-    color: #e5e7eb;
-}
-
 /* Botões padrão */
 .stButton>button {
     background-color: #2563eb;
@@ -193,175 +198,617 @@ div.stAlert {
 }
 </style>
 """
-st.markdown(custom_css, unsafe_allow_html=True)
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@st.cache_resource(show_spinner=False)
+def get_css() -> str:
+    # O Streamlit reexecuta o script a cada rerun; a versão minificada é
+    # calculada uma vez por processo e o mesmo objeto é reenviado
+    return minify_css(custom_css)
+
+
+# Emitido em todo rerun de propósito: um elemento que o rerun não reemite é
+# removido da página, e o estilo sumiria após a primeira interação
+st.markdown(get_css(), unsafe_allow_html=True)
 
 # ============================================================
 # Configurações de admins e e mail
 # ============================================================
 
-ADMIN_EMAILS: List[str] = [
-    e.strip().lower()
-    for e in st.secrets.get("ADMIN_EMAILS", os.getenv("ADMIN_EMAILS", "")).split(",")
-    if e.strip()
-]
+def read_secrets() -> Dict[str, Any]:
+    # Cópia única de st.secrets; sem secrets.toml (só variáveis de ambiente)
+    # o acesso a st.secrets levanta FileNotFoundError
+    try:
+        return dict(st.secrets)
+    except FileNotFoundError:
+        return {}
+
+
+def get_setting(secrets: Dict[str, Any], key: str, default: str = "") -> str:
+    return str(secrets.get(key, os.getenv(key, default)))
+
+
+def normalize_email(email: Optional[str]) -> str:
+    # Forma única de todo e mail que entra no sistema (cadastro, login, leads,
+    # admins), para comparações e índices consistentes
+    return email.strip().lower() if email else ""
+
+
+@dataclass(frozen=True)
+class Config:
+    mongodb_uri: str
+    mongodb_db: str
+    mongodb_max_pool: int
+    mongodb_min_pool: int
+    mongodb_max_idle_ms: int
+    mongodb_wait_queue_ms: int
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_password: str
+    smtp_use_tls: bool
+    smtp_timeout: float
+    mail_enabled: bool
+    from_email: str
+    hero_image: str
+    courses_cache_ttl: int
+    admin_emails: FrozenSet[str]
+    admin_emails_sorted: Tuple[str, ...]
+
+
+# Intervalo para reler st.secrets: alterações (ex.: ADMIN_EMAILS) valem sem
+# reiniciar o processo
+CONFIG_RELOAD_SECONDS = 60
+
+
+@st.cache_resource(ttl=CONFIG_RELOAD_SECONDS, show_spinner=False)
+def load_config() -> Config:
+    # st.secrets e variáveis de ambiente relidos no máximo uma vez por
+    # CONFIG_RELOAD_SECONDS, não a cada rerun
+    secrets = read_secrets()
+    smtp_host = get_setting(secrets, "SMTP_HOST")
+    smtp_user = get_setting(secrets, "SMTP_USER")
+    admin_emails = frozenset(
+        e for e in map(normalize_email, get_setting(secrets, "ADMIN_EMAILS").split(",")) if e
+    )
+    return Config(
+        mongodb_uri=get_setting(secrets, "MONGODB_URI"),
+        mongodb_db=get_setting(secrets, "MONGODB_DB", "aieduc_site"),
+        mongodb_max_pool=int(get_setting(secrets, "MONGODB_MAX_POOL", "100")),
+        mongodb_min_pool=int(get_setting(secrets, "MONGODB_MIN_POOL", "5")),
+        mongodb_max_idle_ms=int(get_setting(secrets, "MONGODB_MAX_IDLE_MS", "300000")),
+        mongodb_wait_queue_ms=int(get_setting(secrets, "MONGODB_WAIT_QUEUE_MS", "10000")),
+        smtp_host=smtp_host,
+        smtp_port=int(get_setting(secrets, "SMTP_PORT", "587")),
+        smtp_user=smtp_user,
+        smtp_password=get_setting(secrets, "SMTP_PASSWORD"),
+        smtp_use_tls=get_setting(secrets, "SMTP_USE_TLS", "true").lower() == "true",
+        smtp_timeout=float(get_setting(secrets, "SMTP_TIMEOUT", "5")),
+        mail_enabled=bool(smtp_host),
+        # Remetente resolvido aqui, e não a cada envio
+        from_email=get_setting(secrets, "FROM_EMAIL") or smtp_user or "no-reply@example.com",
+        hero_image=get_setting(secrets, "HERO_IMAGE", "images/hero_empresa.png"),
+        courses_cache_ttl=int(get_setting(secrets, "COURSES_CACHE_TTL", "300")),
+        admin_emails=admin_emails,
+        admin_emails_sorted=tuple(sorted(admin_emails))
+    )
+
 
-DEFAULT_FROM_EMAIL = st.secrets.get("FROM_EMAIL", os.getenv("FROM_EMAIL", ""))
+CFG = load_config()
 
+# frozenset para checagem O(1) em is_admin; tupla ordenada para envio de e mails.
+# Ambos vêm prontos do Config em cache, sem reconstrução a cada rerun.
+ADMIN_EMAILS: FrozenSet[str] = CFG.admin_emails
+ADMIN_EMAILS_TUPLE: Tuple[str, ...] = CFG.admin_emails_sorted
+
+DEFAULT_FROM_EMAIL = CFG.from_email
 
 def is_admin(email: str) -> bool:
-    if not email:
-        return False
-    return email.lower() in ADMIN_EMAILS
+    # O e mail já vem normalizado (minúsculo) do cadastro, e ADMIN_EMAILS nunca
+    # contém a string vazia: basta a checagem de pertinência no frozenset
+    return email in ADMIN_EMAILS
 
 # ============================================================
 # Conexão com MongoDB
 # ============================================================
 
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+# (coleção, chaves, opções) criados na inicialização do recurso em cache.
+# ativo_ordem_tag segue a regra igualdade -> ordenação -> faixa e atende tanto
+# a vitrine completa quanto o filtro por tag sem ordenação em memória.
+INDEXES: List[Tuple[str, Any, Dict[str, Any]]] = [
+    ("users", "email", {"unique": True, "name": "email_unique"}),
+    ("users", [("email", 1), ("active", 1)], {"name": "email_active"}),
+    ("courses", [("ativo", 1), ("ordem", 1), ("tag", 1)], {"name": "ativo_ordem_tag"}),
+    ("courses", [("ordem", 1), ("_id", 1)], {"name": "ordem_id"}),
+    # Consultas por aluno (inscrições) e por contato (leads)
+    ("inscricoes", [("user_id", 1)], {"name": "user_id"}),
+    ("leads", [("email", 1)], {"name": "email"}),
+    # Listagem dos leads mais recentes primeiro
+    ("leads", [("created_at", -1)], {"name": "created_at_desc"}),
+]
 
-def get_db():
-    uri = st.secrets.get("MONGODB_URI", os.getenv("MONGODB_URI", ""))
-    db_name = st.secrets.get("MONGODB_DB", os.getenv("MONGODB_DB", "aieduc_site"))
 
-    if not uri:
+def ensure_indexes(database) -> None:
+    # Executado apenas na criação do recurso em cache (get_db); cada índice é
+    # independente, para que uma falha do servidor (ex.: e mails duplicados
+    # legados, conflito de nome) não impeça a criação dos demais. Falhas de
+    # conexão propagam: o recurso não fica em cache e os índices são
+    # recriados quando o MongoDB voltar
+    for collection, keys, options in INDEXES:
+        try:
+            database[collection].create_index(keys, **options)
+        except OperationFailure:
+            logger.exception("Falha ao criar o índice %s em %s", options.get("name"), collection)
+    if not has_unique_email_index(database):
+        # Sem o índice único o cadastro volta a checar duplicidade antes do
+        # insert (ver register_user); a falha fica registrada em destaque
+        logger.error("Índice único em users.email ausente; cadastro usará a checagem prévia")
+
+
+def has_unique_email_index(database) -> bool:
+    try:
+        indexes = database["users"].index_information()
+    except OperationFailure:
+        logger.exception("Falha ao listar os índices de users")
+        return False
+    return any(
+        info.get("unique") and info.get("key") == [("email", 1)]
+        for info in indexes.values()
+    )
+
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _unique_email_index(uri: str, db_name: str) -> bool:
+    # Reavaliado periodicamente: o índice pode ser criado depois (ex.: após a
+    # limpeza de e mails duplicados legados) sem reiniciar a aplicação
+    return has_unique_email_index(_get_database(uri, db_name))
+
+
+@st.cache_resource(show_spinner=False)
+def get_client(uri: str) -> MongoClient:
+    # Cliente (e seu pool) criado uma única vez por URI e compartilhado entre
+    # reruns e sessões; a indisponibilidade do servidor aparece na primeira
+    # operação real. Pool explícito, ajustável via st.secrets ou ambiente.
+    return MongoClient(
+        uri,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=CFG.mongodb_max_pool,
+        minPoolSize=CFG.mongodb_min_pool,
+        maxIdleTimeMS=CFG.mongodb_max_idle_ms,
+        waitQueueTimeoutMS=CFG.mongodb_wait_queue_ms,
+        retryWrites=True
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _get_database(uri: str, db_name: str):
+    database = get_client(uri)[db_name]
+    ensure_indexes(database)
+    return database
+
+
+def get_db():
+    # Chamado sob demanda, apenas pelas páginas que acessam o banco
+    if not CFG.mongodb_uri:
         st.error("Configuração do MongoDB ausente. Defina MONGODB_URI e MONGODB_DB em st.secrets ou nas variáveis de ambiente.")
         st.stop()
+    return _get_database(CFG.mongodb_uri, CFG.mongodb_db)
 
-    client = MongoClient(uri, serverSelectionTimeoutMS=5000)
 
+def with_db_errors(fn):
+    # Converte falha de seleção de servidor na mensagem amigável de conexão e
+    # demais erros do driver numa mensagem genérica (o detalhe vai para o log)
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except ServerSelectionTimeoutError:
+            st.error(
+                "Não foi possível conectar ao MongoDB.\n\n"
+                "Verifique se a string de conexão está correta, se o cluster está ativo "
+                "e se o IP do Streamlit está autorizado no MongoDB Atlas."
+            )
+            st.stop()
+        except PyMongoError:
+            logger.exception("Erro do MongoDB em %s", fn.__name__)
+            st.error("Erro ao acessar o banco de dados. Tente novamente em instantes.")
+            st.stop()
+    return wrapper
+
+
+@dataclass(frozen=True)
+class Collections:
+    users: Collection
+    courses: Collection
+    leads: Collection
+    inscricoes: Collection
+
+
+@st.cache_resource(show_spinner=False)
+def get_collections() -> Collections:
+    # Handles das coleções criados uma vez por processo, junto com o cliente
+    database = get_db()
+    # Leads e inscrições (só anexação, gravadas pela fila em segundo plano)
+    # confirmam apenas no primário; usuários e cursos mantêm o padrão do
+    # servidor (majority em replica sets)
+    append_only = WriteConcern(w=1)
+    return Collections(
+        users=database["users"],
+        courses=database["courses"],
+        leads=database.get_collection("leads", write_concern=append_only),
+        inscricoes=database.get_collection("inscricoes", write_concern=append_only)
+    )
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def db_health() -> bool:
+    client = get_db().client
     try:
+        # O monitor do pymongo já acompanha o servidor em segundo plano; o ping
+        # (e seu RTT) só é feito enquanto a topologia ainda não foi descoberta
+        if client.topology_description.has_writable_server():
+            return True
         client.admin.command("ping")
-    except ServerSelectionTimeoutError:
-        st.error(
-            "Não foi possível conectar ao MongoDB.\n\n"
-            "Verifique se a string de conexão está correta, se o cluster está ativo "
-            "e se o IP do Streamlit está autorizado no MongoDB Atlas."
-        )
-        st.stop()
+        return True
+    except Exception:
+        return False
+
+# ============================================================
+# Fila de escrita em lote (leads e inscrições)
+# ============================================================
+
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_SECONDS = 0.2
+
+
+def _drain_writes(write_queue: queue.Queue, collections: Collections) -> None:
+    # Agrupa inserções em lotes de até WRITE_BATCH_SIZE ou WRITE_FLUSH_SECONDS.
+    # As gravações seguem confirmadas (w=1, ver get_collections): já estão fora
+    # da thread da interface, e w=0 perderia as retryable writes numa troca de primário
+    while True:
+        batch = [write_queue.get()]
+        deadline = time.monotonic() + WRITE_FLUSH_SECONDS
+        while len(batch) < WRITE_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(write_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        por_colecao: Dict[str, List[InsertOne]] = {}
+        for collection, op in batch:
+            por_colecao.setdefault(collection, []).append(op)
+
+        for collection, ops in por_colecao.items():
+            try:
+                # Mesmos handles em cache usados pelo restante do app
+                getattr(collections, collection).bulk_write(ops, ordered=False)
+            except BulkWriteError as exc:
+                # ordered=False: os demais documentos do lote já foram gravados
+                logger.error(
+                    "Falha parcial no lote de %d inserções em %s: %s",
+                    len(ops), collection, exc.details
+                )
+            except Exception:
+                logger.exception("Falha no lote de %d inserções em %s", len(ops), collection)
+
 
-    return client[db_name]
+@st.cache_resource(show_spinner=False)
+def get_write_queue() -> queue.Queue:
+    write_queue: queue.Queue = queue.Queue()
+    threading.Thread(
+        target=_drain_writes,
+        args=(write_queue, get_collections()),
+        name="mongo-writer",
+        daemon=True
+    ).start()
+    return write_queue
 
 
-db = get_db()
+def enqueue_insert(collection: str, doc: Dict[str, Any]) -> None:
+    get_write_queue().put((collection, InsertOne(doc)))
+
+# ============================================================
+# Utilitário de data
+# ============================================================
+
+UTC = datetime.timezone.utc
+_now = datetime.datetime.now
+
+
+def utc_now() -> datetime.datetime:
+    # Substitui datetime.utcnow(), obsoleto a partir do Python 3.12
+    return _now(UTC)
 
 # ============================================================
 # Funções de e mail
 # ============================================================
 
-def send_email(to: Union[str, List[str]], subject: str, body: str) -> None:
-    smtp_host = st.secrets.get("SMTP_HOST", os.getenv("SMTP_HOST", ""))
-    if not smtp_host:
+@st.cache_resource(show_spinner=False)
+def get_mail_pool() -> ThreadPoolExecutor:
+    # Um único worker: todos os envios compartilham a mesma conexão SMTP (e o
+    # mesmo lock), então workers extras apenas ficariam bloqueados esperando
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="mail")
+
+
+Recipients = Union[str, List[str], Tuple[str, ...]]
+EmailJob = Tuple[Recipients, str, str]
+
+
+def send_email(to: Recipients, subject: str, body: str) -> None:
+    send_emails([(to, subject, body)])
+
+
+def send_emails(jobs: List[EmailJob]) -> None:
+    # Envio em segundo plano para não bloquear a interface durante o SMTP;
+    # todas as mensagens do lote seguem na mesma sessão SMTP
+    if not CFG.mail_enabled:
         return
+    get_mail_pool().submit(_send_emails_sync, jobs)
+
+
+@st.cache_resource(show_spinner=False)
+def get_smtp_lock() -> threading.Lock:
+    # Lock compartilhado pelo processo inteiro: um Lock de módulo seria recriado
+    # a cada rerun e não protegeria a conexão SMTP em cache
+    return threading.Lock()
 
-    smtp_port = int(st.secrets.get("SMTP_PORT", os.getenv("SMTP_PORT", "587")))
-    smtp_user = st.secrets.get("SMTP_USER", os.getenv("SMTP_USER", ""))
-    smtp_password = st.secrets.get("SMTP_PASSWORD", os.getenv("SMTP_PASSWORD", ""))
-    use_tls = str(st.secrets.get("SMTP_USE_TLS", os.getenv("SMTP_USE_TLS", "true"))).lower() == "true"
-    from_email = DEFAULT_FROM_EMAIL or smtp_user or "no-reply@example.com"
 
-    if isinstance(to, List):
+@st.cache_resource(show_spinner=False)
+def get_smtp() -> smtplib.SMTP:
+    # Conexão SMTP mantida aberta e reutilizada entre envios
+    server = smtplib.SMTP(CFG.smtp_host, CFG.smtp_port, timeout=CFG.smtp_timeout)
+    if CFG.smtp_use_tls:
+        server.starttls()
+    if CFG.smtp_user and CFG.smtp_password:
+        server.login(CFG.smtp_user, CFG.smtp_password)
+    return server
+
+
+def _build_message(to: Recipients, subject: str, body: str, from_email: str) -> Optional[EmailMessage]:
+    # typing.List não deve ser usado em isinstance; aceita list e tuple
+    if isinstance(to, (list, tuple)):
         recipients = [t for t in to if t]
     else:
         recipients = [to] if to else []
 
     if not recipients:
-        return
+        return None
 
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = from_email
     msg["To"] = ", ".join(recipients)
     msg.set_content(body)
+    return msg
 
-    try:
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=10) as server:
-            if use_tls:
-                server.starttls()
-            if smtp_user and smtp_password:
-                server.login(smtp_user, smtp_password)
-            server.send_message(msg)
-    except Exception:
-        pass
+
+def _send_emails_sync(jobs: List[EmailJob]) -> None:
+    messages = [_build_message(to, subject, body, DEFAULT_FROM_EMAIL) for to, subject, body in jobs]
+    messages = [m for m in messages if m is not None]
+    if not messages:
+        return
+
+    with get_smtp_lock():
+        for msg in messages:
+            # Uma nova tentativa caso a conexão em cache tenha caído (servidor
+            # encerrou a sessão ociosa, reset ou timeout de rede)
+            for _ in range(2):
+                server = None
+                try:
+                    server = get_smtp()
+                    server.send_message(msg)
+                    break
+                except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                    get_smtp.clear()
+                    if server is not None:
+                        # Fecha o socket antigo em vez de deixá-lo pendurado
+                        server.close()
+                except Exception:
+                    # Falha no worker não chega a quem chamou (o Future é
+                    # descartado); fica registrada no log do servidor
+                    logger.exception("Falha ao enviar e mail para %s", msg["To"])
+                    break
+            else:
+                logger.warning("E mail para %s não enviado: conexão SMTP caiu duas vezes", msg["To"])
 
 # ============================================================
 # Funções de autenticação
 # ============================================================
 
-def hash_password(password: str, salt: Optional[str] = None) -> str:
+# N = 2^15 (32 MiB por verificação): custo memory-hard na faixa de ~100 ms por
+# login; hashes com N menor são migrados no próximo login (needs_rehash)
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+# O limite padrão do OpenSSL (32 MiB) não comporta N = 2^15 com r = 8
+SCRYPT_MAXMEM = 64 * 1024 * 1024
+
+
+def hash_password(password: str, salt: Optional[bytes] = None) -> str:
     if salt is None:
-        salt = os.urandom(16).hex()
-    hashed = hashlib.sha256((salt + password).encode("utf-8")).hexdigest()
-    return f"{salt}${hashed}"
+        # Um getrandom() por hash: custo de microssegundos diante dos ~100 ms do
+        # scrypt; um buffer de entropia em memória não compensaria o risco
+        salt = os.urandom(16)
+    dk = hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=SCRYPT_N,
+        r=SCRYPT_R,
+        p=SCRYPT_P,
+        dklen=SCRYPT_DKLEN,
+        maxmem=SCRYPT_MAXMEM
+    )
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${dk.hex()}"
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    # Hashes legados (SHA-256) ou com parâmetros scrypt diferentes dos atuais
+    return not stored_hash.startswith(
+        f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+    )
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
+    parts = stored_hash.split("$")
+
+    # Formato legado: salt$sha256(salt + senha)
+    if len(parts) == 2:
+        salt, hashed = parts
+        # Sal e senha alimentados em separado, sem a string concatenada intermediária
+        digest = hashlib.sha256(salt.encode("utf-8"))
+        digest.update(password.encode("utf-8"))
+        check = digest.hexdigest()
+        return hmac.compare_digest(check, hashed)
+
+    if len(parts) != 6 or parts[0] != "scrypt":
+        return False
     try:
-        salt, hashed = stored_hash.split("$")
+        n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+        salt = bytes.fromhex(parts[4])
+        dk = hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            dklen=len(parts[5]) // 2,
+            maxmem=SCRYPT_MAXMEM
+        )
     except ValueError:
         return False
-    check = hashlib.sha256((salt + password).encode("utf-8")).hexdigest()
-    return check == hashed
+    return hmac.compare_digest(dk.hex(), parts[5])
 
 
-def register_user(name: str, email: str, password: str) -> Tuple[bool, str]:
-    users_col = db["users"]
-    if users_col.find_one({"email": email.lower().strip()}):
-        return False, "E mail já cadastrado."
-    pwd_hash = hash_password(password)
-    normalized_email = email.lower().strip()
-    users_col.insert_one(
+def admin_notification(subject: str, intro: str, fields: Dict[str, str]) -> Optional[EmailJob]:
+    # Aviso aos admins no formato "Campo: valor", um por linha; None sem admins
+    if not ADMIN_EMAILS:
+        return None
+    linhas = "\n".join(f"{campo}: {valor}" for campo, valor in fields.items())
+    return ADMIN_EMAILS_TUPLE, subject, f"{intro}\n\n{linhas}\n"
+
+
+def registration_emails(name: str, normalized_email: str, created_at: datetime.datetime) -> List[EmailJob]:
+    # Confirmação ao usuário e aviso aos admins, enviados na mesma sessão SMTP
+    body_user = (
+        f"Olá, {name}.\n\n"
+        "Seu cadastro na plataforma AI & Data Consulting foi concluído com sucesso.\n"
+        "Em breve você receberá novidades sobre cursos, trilhas e conteúdos exclusivos.\n\n"
+        "Atenciosamente,\n"
+        "Equipe AI & Data Consulting"
+    )
+    jobs: List[EmailJob] = [
+        (normalized_email, "Bem vindo(a) à plataforma AI & Data Consulting", body_user)
+    ]
+
+    aviso = admin_notification(
+        "Novo cadastro de usuário no site",
+        "Novo cadastro de usuário no site AI & Data Consulting.",
         {
-            "name": name,
-            "email": normalized_email,
-            "password_hash": pwd_hash,
-            "created_at": datetime.datetime.utcnow(),
-            "active": True
+            "Nome": name,
+            "E mail": normalized_email,
+            # Datetime com fuso: o isoformat já traz o +00:00
+            "Data": created_at.isoformat(timespec="seconds"),
         }
     )
+    if aviso:
+        jobs.append(aviso)
 
+    return jobs
+
+
+@with_db_errors
+def register_user(name: str, email: str, password: str) -> Tuple[bool, str]:
+    # Nome e e mail normalizados uma única vez, antes do scrypt e do acesso ao
+    # banco; os mesmos valores seguem para o documento e para os e mails
+    name = name.strip()
+    normalized_email = normalize_email(email)
+    if not name:
+        return False, "Informe o nome completo."
+    if not normalized_email:
+        return False, "Informe um e mail válido."
+    users_col = get_collections().users
+    pwd_hash = hash_password(password)
+    # Mesmo instante no documento e no aviso aos admins
+    now = utc_now()
+    # A unicidade do e mail é garantida pelo índice único em users.email; se
+    # ele não existir (criação falhou), volta a checagem prévia
+    if not _unique_email_index(CFG.mongodb_uri, CFG.mongodb_db):
+        if users_col.find_one({"email": normalized_email}, {"_id": 1}):
+            return False, "E mail já cadastrado."
     try:
-        body_user = (
-            f"Olá, {name}.\n\n"
-            "Seu cadastro na plataforma AI & Data Consulting foi concluído com sucesso.\n"
-            "Em breve você receberá novidades sobre cursos, trilhas e conteúdos exclusivos.\n\n"
-            "Atenciosamente,\n"
-            "Equipe AI & Data Consulting"
-        )
-        send_email(
-            to=normalized_email,
-            subject="Bem vindo(a) à plataforma AI & Data Consulting",
-            body=body_user
+        users_col.insert_one(
+            {
+                "name": name,
+                "email": normalized_email,
+                "password_hash": pwd_hash,
+                "created_at": now,
+                "active": True
+            }
         )
-    except Exception:
-        pass
+    except DuplicateKeyError:
+        return False, "E mail já cadastrado."
 
-    if ADMIN_EMAILS:
+    # Sem SMTP configurado, nem as mensagens são montadas
+    if CFG.mail_enabled:
         try:
-            body_admin = (
-                "Novo cadastro de usuário no site AI & Data Consulting.\n\n"
-                f"Nome: {name}\n"
-                f"E mail: {normalized_email}\n"
-                f"Data: {datetime.datetime.utcnow().isoformat()} (UTC)\n"
-            )
-            send_email(
-                to=ADMIN_EMAILS,
-                subject="Novo cadastro de usuário no site",
-                body=body_admin
-            )
+            send_emails(registration_emails(name, normalized_email, now))
         except Exception:
             pass
 
     return True, "Cadastro realizado com sucesso. Você já pode fazer login."
 
 
+@st.cache_resource(show_spinner=False)
+def dummy_password_hash() -> str:
+    # Hash descartável com os parâmetros atuais, gerado uma vez por processo
+    return hash_password(os.urandom(16).hex())
+
+
+# Apenas os campos usados no login e na sessão
+LOGIN_PROJECTION = {"_id": 1, "name": 1, "email": 1, "password_hash": 1}
+
+
+def _find_active_user(users_col: Collection, normalized_email: str) -> Optional[Dict[str, Any]]:
+    # Busca direta pelo índice (email, active); sem cache, para que um cadastro
+    # recém feito ou uma conta desativada reflitam imediatamente no login
+    return users_col.find_one(
+        {"email": normalized_email, "active": True},
+        LOGIN_PROJECTION
+    )
+
+
+@with_db_errors
 def login_user(email: str, password: str) -> Tuple[bool, Union[str, Dict[str, Any]]]:
-    users_col = db["users"]
-    user = users_col.find_one({"email": email.lower().strip(), "active": True})
+    users_col = get_collections().users
+    user = _find_active_user(users_col, normalize_email(email))
     if not user:
-        return False, "Usuário não encontrado ou inativo."
-    if not verify_password(password, user.get("password_hash", "")):
-        return False, "Senha incorreta."
+        # Mesmo custo de scrypt e mesma mensagem do caso de senha errada: nem o
+        # tempo de resposta nem o texto revelam quais e mails estão cadastrados
+        verify_password(password, dummy_password_hash())
+        return False, "E mail ou senha incorretos."
+    stored_hash = user.get("password_hash", "")
+    if not verify_password(password, stored_hash):
+        return False, "E mail ou senha incorretos."
+    if needs_rehash(stored_hash):
+        # Migra hashes antigos para os parâmetros atuais no login bem sucedido
+        try:
+            users_col.update_one(
+                {"_id": user["_id"]},
+                {"$set": {"password_hash": hash_password(password)}}
+            )
+        except Exception:
+            pass
     return True, user
 
 
@@ -375,16 +822,34 @@ if "auth_tab" not in st.session_state:
 # Utilitário para imagens
 # ============================================================
 
+# Limite comum dos caches de imagens: cobre o catálogo inteiro sem deixar
+# os data URIs (as maiores entradas) crescerem sem limite na memória
+IMAGE_CACHE_ENTRIES = 512
+
+
+@st.cache_resource(show_spinner=False)
+def local_images() -> FrozenSet[str]:
+    # Listagem de images/ feita uma vez por processo, no lugar de um stat por arquivo
+    if not os.path.isdir("images"):
+        return frozenset()
+    return frozenset(os.listdir("images"))
+
+
+@st.cache_data(max_entries=IMAGE_CACHE_ENTRIES, show_spinner=False)
 def resolve_image_path(path_or_url: str) -> Optional[str]:
+    path_or_url = (path_or_url or "").strip()
     if not path_or_url:
         return None
-    path_or_url = path_or_url.strip()
     if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
         return path_or_url
     if os.path.exists(path_or_url):
         return path_or_url
     candidate = os.path.join("images", path_or_url)
-    if os.path.exists(candidate):
+    if "/" in path_or_url or os.sep in path_or_url:
+        found = os.path.exists(candidate)
+    else:
+        found = path_or_url in local_images()
+    if found:
         return candidate
     return None
 
@@ -392,76 +857,174 @@ def resolve_image_path(path_or_url: str) -> Optional[str]:
 # Cursos no MongoDB - vitrine
 # ============================================================
 
-def get_courses():
-    courses_col = db["courses"]
+# Cursos exibidos quando não há cursos ativos cadastrados no MongoDB
+DEFAULT_COURSES: List[Dict[str, Any]] = [
+    {
+        "nome": "Formação em Python para Programação",
+        "categoria": "Programação",
+        "nivel": "Iniciante a Intermediário",
+        "descricao": "Curso focado em problemas reais e boas práticas modernas em Python.",
+        "carga_horaria": "24h",
+        "tag": "Python",
+        "imagem_url": "",
+        "preco": "997,00",
+        "destaque": True,
+        "proxima_turma": "Próxima turma: Setembro 2025"
+    },
+    {
+        "nome": "Ciência de Dados Aplicada a Negócios",
+        "categoria": "Ciência de Dados",
+        "nivel": "Intermediário",
+        "descricao": "Da coleta à visualização com foco em métricas de negócio e tomada de decisão.",
+        "carga_horaria": "32h",
+        "tag": "Data Science",
+        "imagem_url": "",
+        "preco": "1.297,00",
+        "destaque": True,
+        "proxima_turma": "Próxima turma: Outubro 2025"
+    },
+    {
+        "nome": "Inteligência Artificial e Machine Learning",
+        "categoria": "IA e ML",
+        "nivel": "Intermediário a Avançado",
+        "descricao": "Modelos preditivos, pipelines e implantação em ambiente produtivo.",
+        "carga_horaria": "36h",
+        "tag": "Machine Learning",
+        "imagem_url": "",
+        "preco": "1.497,00",
+        "destaque": True,
+        "proxima_turma": "Próxima turma: Novembro 2025"
+    },
+]
+
+
+# Campos exibidos na vitrine e seus valores padrão
+COURSE_DEFAULTS: Dict[str, Any] = {
+    "nome": None,
+    "categoria": "",
+    "nivel": "",
+    "descricao": "",
+    "carga_horaria": "",
+    "tag": "",
+    "imagem_url": "",
+    "preco": "",
+    "destaque": False,
+    "proxima_turma": ""
+}
+
+COURSE_PROJECTION: Dict[str, int] = {"_id": 0, **{campo: 1 for campo in COURSE_DEFAULTS}}
+
+# O primeiro lote padrão do servidor é de 101 documentos; com 200, um catálogo
+# desse porte chega em um único round trip, sem getMore
+COURSE_CURSOR_BATCH_SIZE = 200
+
+
+@st.cache_data(ttl=CFG.courses_cache_ttl, show_spinner=False)
+def load_courses(tag_filter: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    # Erros de conexão propagam e não são cacheados. cache_data entrega uma
+    # cópia por chamada: nenhuma sessão altera a lista vista pelas demais
+    query: Dict[str, Any] = {"ativo": True}
+    if tag_filter:
+        query["tag"] = {"$in": list(tag_filter)}
+    cursor = get_collections().courses.find(
+        query,
+        projection=COURSE_PROJECTION,
+        batch_size=COURSE_CURSOR_BATCH_SIZE
+    ).sort("ordem", 1)
+    # Documentos completados direto do cursor, sem lista intermediária
+    return [{**COURSE_DEFAULTS, **c} for c in cursor]
+
+
+@st.cache_data(ttl=CFG.courses_cache_ttl, show_spinner=False)
+def load_course_tags() -> List[str]:
+    # Derivadas da vitrine completa já em cache (a mesma consulta da página sem
+    # filtro), em vez de um distinct separado; já ordenadas e sem vazios
+    return sorted({c["tag"] for c in load_courses(None) if c["tag"]})
+
+
+def clear_course_cache() -> None:
+    load_courses.clear()
+    load_course_tags.clear()
+    load_course_grid_html.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def default_courses_by_tag() -> Dict[str, List[Tuple[int, Dict[str, Any]]]]:
+    # Catálogo padrão agrupado por tag uma vez por processo; o filtro só junta
+    # os grupos selecionados, sem percorrer o catálogo inteiro a cada rerun.
+    # Cada curso guarda sua posição para a junção manter a ordem do catálogo
+    grupos: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for posicao, curso in enumerate(DEFAULT_COURSES):
+        grupos.setdefault(curso["tag"], []).append((posicao, curso))
+    return grupos
+
+
+def get_courses(tag_filter: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    # Resultado reaproveitado entre reruns; o painel admin invalida com clear_course_cache().
+    # Filtro em forma canônica: a ordem de seleção das tags não gera nova entrada
+    # no cache, e a ausência de filtro vira None, a mesma chave de load_course_tags
+    tag_filter = tuple(sorted(set(tag_filter))) if tag_filter else None
     try:
-        cursos_db = list(courses_col.find({"ativo": True}).sort("ordem", 1))
+        cursos = load_courses(tag_filter)
     except Exception:
-        cursos_db = []
+        cursos = []
 
-    if cursos_db:
-        return [
-            {
-                "nome": c.get("nome"),
-                "categoria": c.get("categoria", ""),
-                "nivel": c.get("nivel", ""),
-                "descricao": c.get("descricao", ""),
-                "carga_horaria": c.get("carga_horaria", ""),
-                "tag": c.get("tag", ""),
-                "imagem_url": c.get("imagem_url", ""),
-                "preco": c.get("preco", ""),
-                "destaque": c.get("destaque", False),
-                "proxima_turma": c.get("proxima_turma", "")
-            }
-            for c in cursos_db
-        ]
+    if cursos:
+        return cursos
 
-    return [
-        {
-            "nome": "Formação em Python para Programação",
-            "categoria": "Programação",
-            "nivel": "Iniciante a Intermediário",
-            "descricao": "Curso focado em problemas reais e boas práticas modernas em Python.",
-            "carga_horaria": "24h",
-            "tag": "Python",
-            "imagem_url": "",
-            "preco": "997,00",
-            "destaque": True,
-            "proxima_turma": "Próxima turma: Setembro 2025"
-        },
-        {
-            "nome": "Ciência de Dados Aplicada a Negócios",
-            "categoria": "Ciência de Dados",
-            "nivel": "Intermediário",
-            "descricao": "Da coleta à visualização com foco em métricas de negócio e tomada de decisão.",
-            "carga_horaria": "32h",
-            "tag": "Data Science",
-            "imagem_url": "",
-            "preco": "1.297,00",
-            "destaque": True,
-            "proxima_turma": "Próxima turma: Outubro 2025"
-        },
-        {
-            "nome": "Inteligência Artificial e Machine Learning",
-            "categoria": "IA e ML",
-            "nivel": "Intermediário a Avançado",
-            "descricao": "Modelos preditivos, pipelines e implantação em ambiente produtivo.",
-            "carga_horaria": "36h",
-            "tag": "Machine Learning",
-            "imagem_url": "",
-            "preco": "1.497,00",
-            "destaque": True,
-            "proxima_turma": "Próxima turma: Novembro 2025"
-        },
-    ]
+    if tag_filter:
+        grupos = default_courses_by_tag()
+        selecionados = [item for tag in tag_filter for item in grupos.get(tag, ())]
+        selecionados.sort(key=lambda item: item[0])
+        return [curso for _, curso in selecionados]
+    return DEFAULT_COURSES
+
+
+@st.cache_resource(show_spinner=False)
+def default_course_tags() -> List[str]:
+    # Tags do catálogo padrão calculadas uma vez por processo, não a cada rerun
+    return sorted(tag for tag in default_courses_by_tag() if tag)
+
+
+def get_course_tags() -> List[str]:
+    try:
+        tags = load_course_tags()
+    except Exception:
+        tags = []
+    return tags or default_course_tags()
 
 # ============================================================
 # Autenticação na Sidebar, com redirecionamento
 # ============================================================
 
+def _logout() -> None:
+    # O flag is_admin sai junto com o usuário; quem estava no Admin volta ao
+    # Início, já que a opção deixa de existir no rádio de navegação
+    st.session_state["user"] = None
+    if st.session_state.get("nav_page") == "Admin":
+        st.session_state["nav_page"] = "Início"
+
+
 def sidebar_auth():
     st.sidebar.markdown("### Área do aluno")
 
+    # Mensagem registrada antes do último st.rerun()
+    auth_flash = st.session_state.pop("auth_flash", None)
+
+    if st.session_state["user"] is not None:
+        # Sessão logada: rádio de acesso e formulários nem chegam a ser montados
+        if auth_flash:
+            st.sidebar.success(auth_flash)
+        user = st.session_state["user"]
+        st.sidebar.success(f"Conectado como {user['name']}")
+        # Callback roda antes do script: o clique custa um rerun, não dois
+        st.sidebar.button("Sair", on_click=_logout)
+        return
+
+    # A aba só pode ser alterada antes de o rádio ser criado neste rerun
+    if "auth_tab_next" in st.session_state:
+        st.session_state["auth_tab"] = st.session_state.pop("auth_tab_next")
+
     aba = st.sidebar.radio(
         "Acesso",
         ["Entrar", "Cadastrar"],
@@ -472,249 +1035,358 @@ def sidebar_auth():
         "_No futuro, poderá haver um botão de Entrar com Google integrado ao OAuth._"
     )
 
-    if st.session_state["user"] is None:
+    if auth_flash:
+        st.sidebar.success(auth_flash)
 
-        if aba == "Entrar":
-            with st.sidebar.form("login_form"):
-                email = st.text_input("E mail")
-                password = st.text_input("Senha", type="password")
-                submitted = st.form_submit_button("Entrar")
+    if aba == "Entrar":
+        with st.sidebar.form("login_form"):
+            email = st.text_input("E mail")
+            password = st.text_input("Senha", type="password")
+            submitted = st.form_submit_button("Entrar")
 
-                if submitted:
+            if submitted:
+                # scrypt é lento de propósito; o spinner indica o processamento
+                with st.spinner("Verificando credenciais..."):
                     ok, result = login_user(email, password)
+                if ok:
+                    st.session_state["user"] = {
+                        "name": result["name"],
+                        "email": result["email"],
+                        "_id": str(result["_id"]),
+                        # Flag do login usada só para montar o menu; o acesso à
+                        # página é conferido de novo em requires_admin
+                        "is_admin": is_admin(result["email"])
+                    }
+                    st.session_state["auth_flash"] = "Login realizado com sucesso."
+                    st.rerun()
+                else:
+                    st.sidebar.error(result)
+
+    if aba == "Cadastrar":
+        with st.sidebar.form("register_form"):
+            name = st.text_input("Nome completo")
+            email = st.text_input("E mail corporativo ou pessoal")
+            password = st.text_input("Senha", type="password")
+            password2 = st.text_input("Confirmar senha", type="password")
+            submitted = st.form_submit_button("Criar conta")
+
+            if submitted:
+                if password != password2:
+                    st.sidebar.error("As senhas não coincidem.")
+                elif not name or not email or not password:
+                    st.sidebar.error("Preencha todos os campos.")
+                else:
+                    with st.spinner("Criando conta..."):
+                        ok, msg = register_user(name, email, password)
                     if ok:
-                        st.session_state["user"] = {
-                            "name": result["name"],
-                            "email": result["email"],
-                            "_id": str(result["_id"])
-                        }
-                        st.sidebar.success("Login realizado com sucesso. Redirecionando...")
-                        st.sidebar.markdown(
-                            "<script>setTimeout(function(){window.location.reload();},1500);</script>",
-                            unsafe_allow_html=True
-                        )
-                    else:
-                        st.sidebar.error(result)
-
-        if aba == "Cadastrar":
-            with st.sidebar.form("register_form"):
-                name = st.text_input("Nome completo")
-                email = st.text_input("E mail corporativo ou pessoal")
-                password = st.text_input("Senha", type="password")
-                password2 = st.text_input("Confirmar senha", type="password")
-                submitted = st.form_submit_button("Criar conta")
-
-                if submitted:
-                    if password != password2:
-                        st.sidebar.error("As senhas não coincidem.")
-                    elif not name or not email or not password:
-                        st.sidebar.error("Preencha todos os campos.")
+                        st.session_state["auth_flash"] = msg
+                        st.session_state["auth_tab_next"] = "Entrar"
+                        st.rerun()
                     else:
-                        ok, msg = register_user(name, email, password)
-                        if ok:
-                            st.sidebar.success(msg + " Redirecionando para o login...")
-                            st.session_state["auth_tab"] = "Entrar"
-                            st.sidebar.markdown(
-                                "<script>setTimeout(function(){window.location.reload();},1500);</script>",
-                                unsafe_allow_html=True
-                            )
-                        else:
-                            st.sidebar.error(msg)
-    else:
-        user = st.session_state["user"]
-        st.sidebar.success(f"Conectado como {user['name']}")
-        if st.sidebar.button("Sair"):
-            st.session_state["user"] = None
-            st.experimental_rerun()
+                        st.sidebar.error(msg)
 
 # ============================================================
 # Navegação superior fixa e logo central
 # ============================================================
 
 def top_navigation() -> str:
-    st.markdown('<div class="nav-bar"><div class="nav-inner">', unsafe_allow_html=True)
-
-    pages = ["Início", "Serviços", "Cursos", "Contato", "Área do aluno"]
-    if st.session_state["user"] is not None and is_admin(st.session_state["user"].get("email", "")):
+    # Opções derivadas de PAGES: uma página nova entra no mapa e no menu juntas
+    pages = [nome for nome in PAGES if nome != "Admin"]
+    if st.session_state["user"] is not None and st.session_state["user"].get("is_admin", False):
         pages.append("Admin")
 
-    page = st.radio(
-        "",
-        pages,
-        horizontal=True,
-        label_visibility="collapsed",
-        key="nav_page"
-    )
+    # A página inicial da sessão pode vir da URL (?page=Cursos)
+    if "nav_page" not in st.session_state:
+        pagina_url = st.query_params.get("page")
+        if pagina_url in pages:
+            st.session_state["nav_page"] = pagina_url
+
+    # Centralização feita via CSS no container, sem wrappers HTML extras
+    with st.container(key="nav"):
+        page = st.radio(
+            "Navegação",
+            pages,
+            horizontal=True,
+            label_visibility="collapsed",
+            key="nav_page"
+        )
 
-    st.markdown('</div></div>', unsafe_allow_html=True)
+    if st.query_params.get("page") != page:
+        st.query_params["page"] = page
     return page
 
 
+@st.cache_resource(show_spinner=False)
+def center_logo_html() -> str:
+    # Logo em um único bloco HTML montado uma vez por processo; a imagem local
+    # vai como miniatura em data URI (mesmo caminho em cache dos cursos)
+    src = image_src(CFG.hero_image)
+    if not src:
+        return (
+            '<div class="center-logo"><em>Adicione a imagem hero_empresa.png na pasta images/ '
+            "ou defina a variável HERO_IMAGE em Secrets.</em></div>"
+        )
+    return f'<div class="center-logo"><img src="{html_text(src)}" alt="ULTRACORTEX"></div>'
+
+
 def show_center_logo():
-    hero_image_config = st.secrets.get("HERO_IMAGE", os.getenv("HERO_IMAGE", "images/hero_empresa.png"))
-    img_path = resolve_image_path(hero_image_config)
-    cols = st.columns([1, 2, 1])
-    with cols[1]:
-        st.markdown('<div class="center-logo">', unsafe_allow_html=True)
-        if img_path:
-            st.image(img_path, use_container_width=False)
-        else:
-            st.markdown(
-                "_Adicione a imagem hero_empresa.png na pasta images/ ou defina a variável HERO_IMAGE em Secrets._"
-            )
-        st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown(center_logo_html(), unsafe_allow_html=True)
+
+# ============================================================
+# Controle de acesso às páginas
+# ============================================================
+
+def requires_login(message: str):
+    # Interrompe a página antes de qualquer renderização (logo, cards) sem login
+    def decorator(page_fn):
+        @wraps(page_fn)
+        def wrapper(*args, **kwargs):
+            if st.session_state.get("user") is None:
+                st.info(message)
+                return None
+            return page_fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def requires_admin(page_fn):
+    @wraps(page_fn)
+    def wrapper(*args, **kwargs):
+        user = st.session_state.get("user")
+        if user is None:
+            st.warning("Acesso restrito. Faça login com um usuário administrador.")
+            return None
+        # Checagem atual (não a flag guardada no login): remover o e mail de
+        # ADMIN_EMAILS nos secrets revoga o acesso em até CONFIG_RELOAD_SECONDS,
+        # sem esperar novo login
+        if not is_admin(user.get("email", "")):
+            st.warning("Acesso restrito a usuários administradores.")
+            return None
+        return page_fn(*args, **kwargs)
+    return wrapper
 
 # ============================================================
 # Páginas
 # ============================================================
 
+def card_html(css_class: str, title: str, items: List[str]) -> str:
+    itens = "".join(f"<li>{item}</li>" for item in items)
+    return f'<div class="{css_class}"><h4>{title}</h4><ul>{itens}</ul></div>'
+
+
 def page_home():
     show_center_logo()
-    st.markdown("### Inteligência Artificial e Ciência de Dados aplicados ao seu negócio")
     st.markdown(
         """
+        ### Inteligência Artificial e Ciência de Dados aplicados ao seu negócio
+
         Estruturamos projetos de IA, Ciência de Dados e Visão Computacional, e oferecemos trilhas completas de cursos em tecnologia
         para formar e fortalecer o seu time técnico e de gestão.
         """
     )
 
+
+@st.cache_resource(show_spinner=False)
+def service_cards() -> Tuple[str, ...]:
+    # HTML estático dos cards montado uma vez por processo, não a cada rerun
+    return (
+        card_html(
+            "service-card",
+            "Consultorias em Inteligência Artificial e Machine Learning",
+            [
+                "Diagnóstico de maturidade analítica",
+                "Desenho de roadmap de IA para o negócio",
+                "Modelos de Machine Learning orientados a indicadores de resultado",
+                "Governança, explicabilidade e vieses em modelos de IA"
+            ]
+        ),
+        card_html(
+            "service-card",
+            "Projetos de Visão Computacional e Reconhecimento de Padrões",
+            [
+                "Classificação e segmentação de imagens",
+                "Inspeção visual para manufatura e serviços",
+                "Modelos de reconhecimento de padrões em sinais e imagens"
+            ]
+        ),
+        card_html(
+            "service-card",
+            "Conjuntos de Dados e Serviços de Coleta",
+            [
+                "Planejamento de coleta e protocolos de pesquisa",
+                "Coleta de dados em campo e ambientes laboratoriais",
+                "Padronização, anonimização e documentação de datasets"
+            ]
+        ),
+        card_html(
+            "service-card",
+            "Palestras, Workshops e Programas In Company",
+            [
+                "Palestras sobre IA, Ciência de Dados e Transformação Digital",
+                "Workshops práticos para equipes técnicas e de negócio",
+                "Programas de formação continuada em tecnologia"
+            ]
+        )
+    )
+
+
 def page_services():
     show_center_logo()
     st.markdown("### Serviços de consultoria e projetos profissionais")
 
-    col1, col2 = st.columns(2)
+    # Duas linhas de dois cards
+    cards = service_cards()
+    for linha in (cards[:2], cards[2:]):
+        for coluna, card in zip(st.columns(2), linha):
+            coluna.markdown(card, unsafe_allow_html=True)
 
-    with col1:
-        st.markdown('<div class="service-card">', unsafe_allow_html=True)
-        st.markdown("#### Consultorias em Inteligência Artificial e Machine Learning")
-        st.markdown(
-            """
-            - Diagnóstico de maturidade analítica  
-            - Desenho de roadmap de IA para o negócio  
-            - Modelos de Machine Learning orientados a indicadores de resultado  
-            - Governança, explicabilidade e vieses em modelos de IA  
-            """
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
 
-    with col2:
-        st.markdown('<div class="service-card">', unsafe_allow_html=True)
-        st.markdown("#### Projetos de Visão Computacional e Reconhecimento de Padrões")
-        st.markdown(
-            """
-            - Classificação e segmentação de imagens  
-            - Inspeção visual para manufatura e serviços  
-            - Modelos de reconhecimento de padrões em sinais e imagens  
-            """
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
+def html_text(value: Any) -> str:
+    return escape(str(value)) if value is not None else ""
 
-    st.markdown("")
-    col3, col4 = st.columns(2)
-    with col3:
-        st.markdown('<div class="service-card">', unsafe_allow_html=True)
-        st.markdown("#### Conjuntos de Dados e Serviços de Coleta")
-        st.markdown(
-            """
-            - Planejamento de coleta e protocolos de pesquisa  
-            - Coleta de dados em campo e ambientes laboratoriais  
-            - Padronização, anonimização e documentação de datasets  
-            """
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
-    with col4:
-        st.markdown('<div class="service-card">', unsafe_allow_html=True)
-        st.markdown("#### Palestras, Workshops e Programas In Company")
-        st.markdown(
-            """
-            - Palestras sobre IA, Ciência de Dados e Transformação Digital  
-            - Workshops práticos para equipes técnicas e de negócio  
-            - Programas de formação continuada em tecnologia  
-            """
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
 
+COURSE_THUMB_WIDTH = 400
 
-def page_courses():
-    show_center_logo()
-    st.markdown("### Vitrine de cursos e turmas")
-    st.markdown(
-        '<p class="subtitle">Cursos práticos em Python, Ciência de Dados, IA, Visualização e Bancos de Dados</p>',
-        unsafe_allow_html=True
-    )
 
-    cursos = get_courses()
-    tags = sorted(list({c["tag"] for c in cursos if c.get("tag")}))
-    filtro_tag = st.multiselect("Filtrar por trilha ou foco", options=tags, default=[])
+@st.cache_data(ttl=3600, max_entries=IMAGE_CACHE_ENTRIES, show_spinner=False)
+def thumbnail_bytes(path: str, width: int = COURSE_THUMB_WIDTH) -> Tuple[str, bytes]:
+    # Miniatura reduzida uma única vez por caminho e largura. Fotos JPEG seguem
+    # em JPEG: regravadas como PNG ficariam várias vezes maiores no data URI
+    with Image.open(path) as img:
+        is_jpeg = img.format == "JPEG"
+        img.thumbnail((width, width * 2), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if is_jpeg:
+            img.convert("RGB").save(buffer, format="JPEG", quality=85, optimize=True)
+        else:
+            img.save(buffer, format="PNG", optimize=True)
+    return ("image/jpeg" if is_jpeg else "image/png"), buffer.getvalue()
 
-    col_a, col_b, col_c = st.columns(3)
-    cols = [col_a, col_b, col_c]
-    idx_col = 0
 
-    inscricoes_col = db["inscricoes"]
+@st.cache_data(max_entries=IMAGE_CACHE_ENTRIES, show_spinner=False)
+def image_src(path_or_url: str) -> Optional[str]:
+    # URLs vão direto para o <img>; arquivos locais viram data URI da miniatura
+    img_path = resolve_image_path(path_or_url)
+    if not img_path or img_path.startswith(("http://", "https://")):
+        return img_path
+    try:
+        mime, raw = thumbnail_bytes(img_path)
+    except Exception:
+        return None
+    return f"data:{mime};base64,{base64.b64encode(raw).decode('ascii')}"
+
+
+def course_card_html(curso: Dict[str, Any]) -> str:
+    # Card completo montado em um único bloco HTML
+    partes = ['<div class="course-card">']
+    # Sem imagem (caso comum), nem passa pela chave de cache de image_src
+    raw_url = curso.get("imagem_url")
+    src = image_src(raw_url) if raw_url else None
+    if src:
+        # loading="lazy": imagens remotas fora da tela não são baixadas de imediato
+        partes.append(
+            f'<img class="course-image" src="{html_text(src)}" '
+            f'alt="{html_text(curso.get("nome"))}" loading="lazy">'
+        )
+    if curso.get("destaque"):
+        partes.append('<span class="badge-destaque">Curso carro chefe</span>')
+    elif curso.get("tag"):
+        partes.append(f'<span class="badge">{html_text(curso["tag"])}</span>')
+
+    partes.append(f"<h4>{html_text(curso['nome'])}</h4>")
+    partes.append(
+        f"<p><strong>Categoria:</strong> {html_text(curso['categoria'])}<br>"
+        f"<strong>Nível:</strong> {html_text(curso['nivel'])}<br>"
+        f"<strong>Carga horária:</strong> {html_text(curso['carga_horaria'])}</p>"
+    )
 
-    for idx, curso in enumerate(cursos):
-        if filtro_tag and curso.get("tag") not in filtro_tag:
-            continue
+    preco = curso.get("preco", "")
+    if preco:
+        partes.append(f'<div class="course-price">R$ {html_text(preco)}</div>')
 
-        with cols[idx_col]:
-            st.markdown('<div class="course-card">', unsafe_allow_html=True)
+    proxima = curso.get("proxima_turma", "")
+    if proxima:
+        partes.append(f'<div class="course-next">{html_text(proxima)}</div>')
 
-            img_path = resolve_image_path(curso.get("imagem_url", ""))
-            if img_path:
-                st.image(img_path, use_column_width=True)
+    partes.append(f"<p>{html_text(curso['descricao'])}</p>")
+    partes.append("</div>")
+    return "".join(partes)
 
-            topo = ""
-            if curso.get("destaque"):
-                topo = '<span class="badge-destaque">Curso carro chefe</span>'
-            elif curso.get("tag"):
-                topo = f'<span class="badge">{curso["tag"]}</span>'
 
-            if topo:
-                st.markdown(topo, unsafe_allow_html=True)
+def course_cards_html(cursos: List[Dict[str, Any]]) -> str:
+    return "".join(course_card_html(curso) for curso in cursos)
 
-            st.markdown(f"#### {curso['nome']}")
-            st.markdown(
-                f"**Categoria:** {curso['categoria']}  \n"
-                f"**Nível:** {curso['nivel']}  \n"
-                f"**Carga horária:** {curso['carga_horaria']}"
-            )
 
-            preco = curso.get("preco", "")
-            if preco:
-                st.markdown(f'<div class="course-price">R$ {preco}</div>', unsafe_allow_html=True)
+@st.cache_data(ttl=CFG.courses_cache_ttl, show_spinner=False)
+def load_course_grid_html(_cursos: List[Dict[str, Any]]) -> str:
+    # Uma única entrada: só a vitrine sem filtro (a visão padrão) fica em
+    # cache, montada da lista que get_courses já trouxe (_cursos não entra na
+    # chave); clear_course_cache a invalida junto com os cursos
+    return course_cards_html(_cursos)
 
-            proxima = curso.get("proxima_turma", "")
-            if proxima:
-                st.markdown(f'<div class="course-next">{proxima}</div>', unsafe_allow_html=True)
 
-            st.markdown("")
-            st.markdown(curso["descricao"])
+def course_grid_html(tag_filter: Optional[Tuple[str, ...]], cursos: List[Dict[str, Any]]) -> str:
+    # Sempre a partir da lista já resolvida por get_courses: com o banco fora
+    # do ar não há nova tentativa de conexão só para montar o HTML
+    if tag_filter is None and cursos is not DEFAULT_COURSES:
+        grid = load_course_grid_html(cursos)
+    else:
+        # Filtros e catálogo padrão: montados sem cache
+        grid = course_cards_html(cursos)
+    return f'<div class="course-grid">{grid}</div>'
 
-            st.markdown("")
-            btn_key = f"inscricao_{idx}"
-            if st.button("Inscrever me", key=btn_key):
-                if st.session_state["user"] is None:
-                    st.warning("Faça login na barra lateral para concluir a pré inscrição neste curso.")
-                else:
-                    user = st.session_state["user"]
-                    inscricoes_col.insert_one(
-                        {
-                            "user_id": user["_id"],
-                            "user_name": user["name"],
-                            "user_email": user["email"],
-                            "curso_nome": curso["nome"],
-                            "curso_tag": curso.get("tag", ""),
-                            "curso_preco": preco,
-                            "curso_proxima_turma": proxima,
-                            "created_at": datetime.datetime.utcnow()
-                        }
-                    )
-                    st.success("Pré inscrição registrada. Entraremos em contato com você para próximos passos.")
 
-            st.markdown("</div>", unsafe_allow_html=True)
+@st.fragment
+def page_courses():
+    # Filtro e inscrição reexecutam só a página, sem sidebar e navegação
+    show_center_logo()
+    # Título e subtítulo em um único elemento
+    st.markdown(
+        "### Vitrine de cursos e turmas\n\n"
+        '<p class="subtitle">Cursos práticos em Python, Ciência de Dados, IA, Visualização e Bancos de Dados</p>',
+        unsafe_allow_html=True
+    )
 
-        idx_col = (idx_col + 1) % 3
+    tags = get_course_tags()
+    filtro_tag = st.multiselect("Filtrar por trilha ou foco", options=tags, default=[])
+    # Filtro por tag resolvido no MongoDB, em forma canônica para os caches
+    filtro = tuple(sorted(filtro_tag)) or None
+    cursos = get_courses(filtro)
+
+    # Vitrine inteira enviada em uma única mensagem; sem filtro, com o HTML em cache
+    st.markdown(course_grid_html(filtro, cursos), unsafe_allow_html=True)
+
+    if cursos:
+        # Opção pelo nome (valor estável), não pela posição: a lista pode mudar
+        # entre a renderização e o envio (admin ou expiração do cache)
+        por_nome = {curso["nome"]: curso for curso in cursos}
+        with st.form("inscricao_form"):
+            nome_curso = st.selectbox("Curso para pré inscrição", options=list(por_nome))
+            submitted = st.form_submit_button("Inscrever me")
+
+        if submitted:
+            curso = por_nome.get(nome_curso)
+            if curso is None:
+                st.warning("Este curso não está mais disponível. Selecione outro curso.")
+            elif st.session_state["user"] is None:
+                st.warning("Faça login na barra lateral para concluir a pré inscrição neste curso.")
+            else:
+                user = st.session_state["user"]
+                # Mesma fila em lote dos leads: o clique não espera o MongoDB
+                enqueue_insert(
+                    "inscricoes",
+                    {
+                        "user_id": user["_id"],
+                        "user_name": user["name"],
+                        "user_email": user["email"],
+                        "curso_nome": curso["nome"],
+                        "curso_tag": curso.get("tag", ""),
+                        "curso_preco": curso.get("preco", ""),
+                        "curso_proxima_turma": curso.get("proxima_turma", ""),
+                        "created_at": utc_now()
+                    }
+                )
+                st.success("Pré inscrição registrada. Entraremos em contato com você para próximos passos.")
 
     st.markdown("---")
     if st.session_state["user"] is None:
@@ -723,7 +1395,9 @@ def page_courses():
         st.success("Você está logado. Em versões futuras, esta área exibirá suas inscrições e acesso às aulas.")
 
 
+@st.fragment
 def page_contact():
+    # Envio do formulário reexecuta só a página
     show_center_logo()
     st.markdown("### Fale conosco para projetos, consultorias e programas de cursos")
 
@@ -749,18 +1423,27 @@ def page_contact():
             submitted = st.form_submit_button("Enviar mensagem")
 
             if submitted:
-                leads_col = db["leads"]
-                leads_col.insert_one(
-                    {
-                        "nome": nome,
-                        "email": email,
-                        "empresa": empresa,
-                        "tipo_interesse": tipo_interesse,
-                        "mensagem": mensagem,
-                        "created_at": datetime.datetime.utcnow()
-                    }
-                )
-                st.success("Mensagem enviada com sucesso. Em breve entraremos em contato.")
+                # Normalizados como no cadastro: só espaços conta como vazio
+                nome = nome.strip()
+                email = normalize_email(email)
+                mensagem = mensagem.strip()
+                if not nome or not email or not mensagem:
+                    # Envio vazio não chega à fila de escrita
+                    st.error("Preencha nome, e mail e mensagem.")
+                else:
+                    # Gravação do lead em lote, fora da thread da interface
+                    enqueue_insert(
+                        "leads",
+                        {
+                            "nome": nome,
+                            "email": email,
+                            "empresa": empresa,
+                            "tipo_interesse": tipo_interesse,
+                            "mensagem": mensagem,
+                            "created_at": utc_now()
+                        }
+                    )
+                    st.success("Mensagem enviada com sucesso. Em breve entraremos em contato.")
 
     with col2:
         st.markdown("#### Como funcionam os projetos")
@@ -782,14 +1465,11 @@ def page_contact():
         )
 
 
+@requires_login("Faça login pela barra lateral para acessar a área do aluno.")
 def page_dashboard_user():
     show_center_logo()
     st.markdown("### Área do aluno - versão inicial")
 
-    if st.session_state["user"] is None:
-        st.info("Faça login pela barra lateral para acessar a área do aluno.")
-        return
-
     user = st.session_state["user"]
     st.success(f"Bem vindo, {user['name']}!")
     st.markdown(
@@ -806,20 +1486,248 @@ def page_dashboard_user():
 # Painel administrativo
 # ============================================================
 
+# Coluna exibida -> (campo no MongoDB, tipo); o tipo fixo evita colunas Arrow
+# com tipos misturados quando documentos antigos gravaram números ou nulos
+ADMIN_TABLE_COLUMNS: Dict[str, Tuple[str, type]] = {
+    "Nome": ("nome", str),
+    "Categoria": ("categoria", str),
+    "Nível": ("nivel", str),
+    "Carga horária": ("carga_horaria", str),
+    "Tag": ("tag", str),
+    "Preço": ("preco", str),
+    "Próx turma": ("proxima_turma", str),
+    "Destaque": ("destaque", bool),
+    "Ordem": ("ordem", int),
+    "Ativo": ("ativo", bool),
+}
+
+# Schema Arrow explícito: sem inferência de tipos a cada renderização
+ADMIN_TABLE_SCHEMA = pa.schema(
+    [
+        (nome, {str: pa.string(), bool: pa.bool_(), int: pa.int64()}[tipo])
+        for nome, (_, tipo) in ADMIN_TABLE_COLUMNS.items()
+    ]
+)
+
+# Campos lidos na listagem do admin (sem descrição e imagem), derivados das
+# colunas exibidas para que tabela e projeção não saiam de sincronia
+ADMIN_COURSE_PROJECTION: Dict[str, int] = {
+    campo: 1 for campo, _ in ADMIN_TABLE_COLUMNS.values()
+}
+
+ADMIN_CURSOR_BATCH_SIZE = 200
+ADMIN_PAGE_SIZE = 50
+
+
+def load_admin_courses(after: Optional[Tuple[Optional[int], str]] = None) -> List[Dict[str, Any]]:
+    # Paginação por chave (ordem, _id) em vez de skip; traz um item extra
+    # para saber se existe próxima página
+    courses_col = get_collections().courses
+    query: Dict[str, Any] = {}
+    if after is not None:
+        ordem, last_id = after
+        if ordem is None:
+            # Cursos sem ordem vêm antes dos numerados na ordenação crescente;
+            # {"ordem": None} também casa com o campo ausente
+            query = {
+                "$or": [
+                    {"ordem": None, "_id": {"$gt": ObjectId(last_id)}},
+                    {"ordem": {"$ne": None}}
+                ]
+            }
+        else:
+            query = {
+                "$or": [
+                    {"ordem": {"$gt": ordem}},
+                    {"ordem": ordem, "_id": {"$gt": ObjectId(last_id)}}
+                ]
+            }
+    cursor = courses_col.find(
+        query,
+        projection=ADMIN_COURSE_PROJECTION,
+        batch_size=ADMIN_CURSOR_BATCH_SIZE
+    ).sort([("ordem", 1), ("_id", 1)]).limit(ADMIN_PAGE_SIZE + 1)
+    return list(cursor)
+
+
+def _admin_cell(valor: Any, tipo: type) -> Any:
+    # Documentos legados podem trazer valores fora do tipo (ex.: ordem "x");
+    # a célula cai no padrão do tipo em vez de derrubar a página inteira
+    try:
+        return tipo(valor or tipo())
+    except (TypeError, ValueError):
+        return tipo()
+
+
+# (tabela Arrow, rótulos por _id, chave da próxima página ou None)
+AdminPage = Tuple[pa.Table, Dict[ObjectId, str], Optional[Tuple[Optional[int], str]]]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_admin_page(after: Optional[Tuple[Optional[int], str]] = None) -> AdminPage:
+    # Página já convertida: os cliques no fragmento reaproveitam a tabela e os
+    # rótulos prontos, sem refazer a consulta nem a conversão
+    cursos_db = load_admin_courses(after)
+    has_next = len(cursos_db) > ADMIN_PAGE_SIZE
+    cursos_db = cursos_db[:ADMIN_PAGE_SIZE]
+
+    # Tabela montada coluna a coluna (uma list comprehension por coluna, sem
+    # appends célula a célula), já no formato Arrow do st.dataframe
+    colunas: Dict[str, List[Any]] = {
+        nome: [_admin_cell(c.get(campo), tipo) for c in cursos_db]
+        for nome, (campo, tipo) in ADMIN_TABLE_COLUMNS.items()
+    }
+    # _id -> rótulo: o selectbox trabalha direto com os _ids
+    rotulos: Dict[ObjectId, str] = {
+        c["_id"]: f"{c.get('nome','')} ({c.get('tag','')})" for c in cursos_db
+    }
+    # Cursos com mesmo nome e tag ganham o final do _id, para que o admin veja
+    # qual deles está selecionando
+    repetidos = {r for r, n in Counter(rotulos.values()).items() if n > 1}
+    if repetidos:
+        rotulos = {
+            oid: f"{r} #{str(oid)[-6:]}" if r in repetidos else r
+            for oid, r in rotulos.items()
+        }
+
+    proxima_chave = None
+    if has_next:
+        ultimo = cursos_db[-1]
+        # Valor real de ordem (None se ausente), coerente com a ordenação do banco
+        proxima_chave = (ultimo.get("ordem"), str(ultimo["_id"]))
+    return pa.table(colunas, schema=ADMIN_TABLE_SCHEMA), rotulos, proxima_chave
+
+
+def _admin_next_page(last: Tuple[Optional[int], str]) -> None:
+    st.session_state["admin_page_starts"].append(last)
+
+
+def _admin_prev_page() -> None:
+    st.session_state["admin_page_starts"].pop()
+
+
+def _queue_course_op(curso_id: ObjectId, descricao: str, op: Union[UpdateOne, DeleteOne]) -> None:
+    # Uma operação por curso (a última vence): com ordered=False o MongoDB não
+    # garante a ordem entre operações do mesmo documento
+    st.session_state.setdefault("pending_ops", {})[curso_id] = (descricao, op)
+
+
+@st.fragment
+@with_db_errors
+def manage_courses_fragment():
+    # Ações de gerenciamento reexecutam só este fragmento, não o app inteiro
+    courses_col = get_collections().courses
+
+    st.markdown("#### Cursos cadastrados")
+
+    admin_flash = st.session_state.pop("admin_flash", None)
+    if admin_flash:
+        st.success(admin_flash)
+    admin_flash_error = st.session_state.pop("admin_flash_error", None)
+    if admin_flash_error:
+        st.error(admin_flash_error)
+
+    if st.button("Atualizar vitrine de cursos"):
+        clear_course_cache()
+        load_admin_page.clear()
+        st.success("Vitrine de cursos atualizada.")
+
+    page_starts = st.session_state.setdefault("admin_page_starts", [None])
+    tabela, rotulos, proxima_chave = load_admin_page(page_starts[-1])
+    # Página esvaziada após exclusões: volta para a anterior na mesma execução
+    # (st.rerun(scope="fragment") não vale quando o app inteiro está rodando)
+    while not rotulos and len(page_starts) > 1:
+        page_starts.pop()
+        tabela, rotulos, proxima_chave = load_admin_page(page_starts[-1])
+    if not rotulos:
+        st.info("Nenhum curso cadastrado ainda.")
+        return
+
+    st.dataframe(tabela, use_container_width=True)
+
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        st.button(
+            "Anterior",
+            disabled=len(page_starts) == 1,
+            on_click=_admin_prev_page
+        )
+    with col_next:
+        st.button(
+            "Próxima página",
+            disabled=proxima_chave is None,
+            on_click=_admin_next_page,
+            args=(proxima_chave,)
+        )
+
+    st.markdown("#### Editar status ou remover curso")
+
+    curso_id = st.selectbox("Selecione um curso", options=list(rotulos), format_func=rotulos.get)
+    escolha = rotulos[curso_id]
+
+    # Alterações acumuladas na sessão e gravadas juntas em um único bulk_write
+    pending_ops = st.session_state.setdefault("pending_ops", {})
+
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.button(
+            "Ativar curso",
+            on_click=_queue_course_op,
+            args=(curso_id, f"Ativar: {escolha}", UpdateOne({"_id": curso_id}, {"$set": {"ativo": True}}))
+        )
+    with col_b:
+        st.button(
+            "Desativar curso",
+            on_click=_queue_course_op,
+            args=(curso_id, f"Desativar: {escolha}", UpdateOne({"_id": curso_id}, {"$set": {"ativo": False}}))
+        )
+    with col_c:
+        st.button(
+            "Excluir curso",
+            on_click=_queue_course_op,
+            args=(curso_id, f"Excluir: {escolha}", DeleteOne({"_id": curso_id}))
+        )
+
+    if pending_ops:
+        st.markdown("#### Alterações pendentes")
+        st.markdown("\n".join(f"- {descricao}" for descricao, _ in pending_ops.values()))
+
+        col_aplicar, col_descartar = st.columns(2)
+        with col_aplicar:
+            if st.button("Aplicar alterações"):
+                ids = list(pending_ops)
+                falhas: Dict[int, str] = {}
+                try:
+                    courses_col.bulk_write([op for _, op in pending_ops.values()], ordered=False)
+                except BulkWriteError as exc:
+                    # ordered=False: as demais operações foram aplicadas; só as
+                    # que falharam continuam pendentes
+                    falhas = {e["index"]: e.get("errmsg", "") for e in exc.details.get("writeErrors", [])}
+                    logger.error("Falha parcial ao aplicar alterações de cursos: %s", exc.details)
+                for i, oid in enumerate(ids):
+                    if i not in falhas:
+                        del pending_ops[oid]
+                clear_course_cache()
+                load_admin_page.clear()
+                st.session_state["admin_flash"] = f"{len(ids) - len(falhas)} alteração(ões) aplicada(s)."
+                if falhas:
+                    st.session_state["admin_flash_error"] = "Falha ao aplicar:\n" + "\n".join(
+                        f"- {pending_ops[ids[i]][0]}: {msg}" for i, msg in sorted(falhas.items())
+                    )
+                st.rerun(scope="fragment")
+        with col_descartar:
+            st.button("Descartar alterações", on_click=pending_ops.clear)
+
+@requires_admin
+@with_db_errors
 def page_admin():
     show_center_logo()
     st.markdown("### Painel administrativo de cursos")
 
-    if st.session_state["user"] is None:
-        st.warning("Acesso restrito. Faça login com um usuário administrador.")
-        return
+    courses_col = get_collections().courses
 
-    email_user = st.session_state["user"].get("email", "")
-    if not is_admin(email_user):
-        st.warning("Acesso restrito a usuários administradores.")
-        return
-
-    courses_col = db["courses"]
+    if not db_health():
+        st.error("MongoDB indisponível no momento. As alterações podem falhar.")
 
     aba_cadastro, aba_gerenciar = st.tabs(["Cadastrar curso", "Gerenciar cursos"])
 
@@ -859,85 +1767,41 @@ def page_admin():
                         "descricao": descricao,
                         "ordem": int(ordem),
                         "ativo": bool(ativo),
-                        "created_at": datetime.datetime.utcnow()
+                        "created_at": utc_now()
                     }
                     courses_col.insert_one(doc)
+                    clear_course_cache()
+                    load_admin_page.clear()
+                    local_images.clear()
+                    resolve_image_path.clear()
+                    image_src.clear()
+                    thumbnail_bytes.clear()
+                    center_logo_html.clear()
+                    # Sem rerun: a aba "Gerenciar cursos" é renderizada depois
+                    # deste formulário, já com os caches limpos
                     st.success("Curso cadastrado com sucesso.")
-                    st.experimental_rerun()
 
     with aba_gerenciar:
-        st.markdown("#### Cursos cadastrados")
-
-        cursos_db = list(courses_col.find().sort("ordem", 1))
-        if not cursos_db:
-            st.info("Nenhum curso cadastrado ainda.")
-            return
-
-        data_view = [
-            {
-                "Nome": c.get("nome", ""),
-                "Categoria": c.get("categoria", ""),
-                "Nível": c.get("nivel", ""),
-                "Carga horária": c.get("carga_horaria", ""),
-                "Tag": c.get("tag", ""),
-                "Preço": c.get("preco", ""),
-                "Próx turma": c.get("proxima_turma", ""),
-                "Destaque": c.get("destaque", False),
-                "Ordem": c.get("ordem", 0),
-                "Ativo": c.get("ativo", False),
-            }
-            for c in cursos_db
-        ]
-        st.dataframe(data_view, use_container_width=True)
-
-        st.markdown("#### Editar status ou remover curso")
-
-        labels = [
-            f"{c.get('nome','')} ({c.get('tag','')})"
-            for c in cursos_db
-        ]
-        mapa_label_id = {label: c["_id"] for label, c in zip(labels, cursos_db)}
-
-        escolha = st.selectbox("Selecione um curso", options=labels)
-        curso_id = mapa_label_id.get(escolha)
-
-        col_a, col_b, col_c = st.columns(3)
-        with col_a:
-            if st.button("Ativar curso"):
-                courses_col.update_one({"_id": curso_id}, {"$set": {"ativo": True}})
-                st.success("Curso ativado.")
-                st.experimental_rerun()
-        with col_b:
-            if st.button("Desativar curso"):
-                courses_col.update_one({"_id": curso_id}, {"$set": {"ativo": False}})
-                st.success("Curso desativado.")
-                st.experimental_rerun()
-        with col_c:
-            if st.button("Excluir curso"):
-                courses_col.delete_one({"_id": curso_id})
-                st.success("Curso excluído.")
-                st.experimental_rerun()
+        manage_courses_fragment()
 
 # ============================================================
 # Layout principal
 # ============================================================
 
+PAGES: Dict[str, Callable[[], None]] = {
+    "Início": page_home,
+    "Serviços": page_services,
+    "Cursos": page_courses,
+    "Contato": page_contact,
+    "Área do aluno": page_dashboard_user,
+    "Admin": page_admin,
+}
+
+
 def main():
     sidebar_auth()
     page = top_navigation()
-
-    if page == "Início":
-        page_home()
-    elif page == "Serviços":
-        page_services()
-    elif page == "Cursos":
-        page_courses()
-    elif page == "Contato":
-        page_contact()
-    elif page == "Área do aluno":
-        page_dashboard_user()
-    elif page == "Admin":
-        page_admin()
+    PAGES.get(page, page_home)()
 
 
 if __name__ == "__main__":